@@ -19,16 +19,22 @@ Set environment variables:
 
 import os
 import re
+import json
 import time
 import logging
-from urllib.parse import urlparse
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse, urlunparse
 from typing import Optional
 
 try:
     import requests
-    from bs4 import BeautifulSoup
+    import xxhash
+    from requests.adapters import HTTPAdapter
+    from lxml import etree
 except ImportError:
-    print("Install: pip install requests beautifulsoup4")
+    print("Install: pip install requests lxml xxhash")
     exit(1)
 
 try:
@@ -70,6 +76,132 @@ DEFAULT_SEARCH_QUERIES = [
 ]
 
 
+class SearchCache:
+    """
+    On-disk TTL cache for search API results.
+
+    The queries in DEFAULT_SEARCH_QUERIES barely change between runs, so
+    repeat runs (especially daemon mode) can reuse recent results instead
+    of burning paid API quota on identical searches.
+    """
+
+    def __init__(self, path: str = "./search_cache.db"):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS search_cache (
+                key TEXT PRIMARY KEY,
+                results TEXT,
+                cached_at REAL
+            )
+        """)
+        self.conn.commit()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        raw = '|'.join(str(p) for p in parts)
+        # Cache keys don't need a cryptographic hash
+        return xxhash.xxh3_64_hexdigest(raw)
+
+    def get(self, key: str, ttl: float) -> Optional[list]:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT results, cached_at FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or time.time() - row[1] > ttl:
+            return None
+        return json.loads(row[0])
+
+    def put(self, key: str, results: list):
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT results FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+            # Keep the richer entry: a thin refresh (rate-limited, partial
+            # page) shouldn't clobber a previously complete result set
+            if row is not None and len(results) < len(json.loads(row[0])):
+                return
+            self.conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, results, cached_at) VALUES (?, ?, ?)",
+                (key, json.dumps(results), time.time())
+            )
+            self.conn.commit()
+
+
+# Google CSE results churn roughly daily; SerpApi is used for the same
+# evergreen queries and can be held longer
+CACHE_TTL_GOOGLE = 86400
+CACHE_TTL_SERPAPI = 7 * 86400
+
+_search_cache: Optional[SearchCache] = None
+
+
+def _get_search_cache() -> SearchCache:
+    global _search_cache
+    if _search_cache is None:
+        _search_cache = SearchCache()
+    return _search_cache
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket for spacing API requests.
+
+    Replaces fixed sleeps between queries: when quota is ample requests
+    flow at the configured rate, and when the provider reports pressure
+    (rate-limit headers, 429 Retry-After) the bucket adapts instead of
+    hammering on regardless.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate  # Tokens added per second
+        self.capacity = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request slot is available"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now >= self._blocked_until:
+                    self._tokens = min(
+                        self.capacity,
+                        self._tokens + (now - self._updated) * self.rate
+                    )
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+                else:
+                    wait = self._blocked_until - now
+            time.sleep(wait)
+
+    def update_from_headers(self, headers):
+        """Adapt the refill rate to the provider's reported quota"""
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+        if remaining is None or reset is None:
+            return
+        try:
+            window = max(float(reset) - time.time(), 1.0)
+            rate = max(float(remaining) / window, 0.1)
+        except ValueError:
+            return
+        with self._lock:
+            self.rate = rate
+
+    def penalize(self, seconds: float):
+        """Hold all requests for a period (e.g. a 429 Retry-After)"""
+        with self._lock:
+            self._blocked_until = max(
+                self._blocked_until, time.monotonic() + seconds
+            )
+
+
 class GoogleCustomSearcher:
     """
     Uses Google Custom Search API to discover job postings.
@@ -81,37 +213,64 @@ class GoogleCustomSearcher:
     def __init__(self, api_key: str = None, cse_id: str = None):
         self.api_key = api_key or os.getenv("GOOGLE_API_KEY", "")
         self.cse_id = cse_id or os.getenv("GOOGLE_CSE_ID", "")
-        self.service = None
-        
-        if GOOGLE_API_AVAILABLE and self.api_key and self.cse_id:
+        self._local = threading.local()
+        # CSE allows ~1 QPS sustained on the free tier; shared across
+        # worker threads so concurrent discovery stays under it
+        self._limiter = RateLimiter(rate=1.0, burst=2)
+        self.service = self._get_service()
+
+    def _get_service(self):
+        """Get a service object for the current thread.
+
+        googleapiclient services wrap httplib2.Http, which is not thread-safe,
+        so concurrent discovery builds one service per worker thread.
+        """
+        if not (GOOGLE_API_AVAILABLE and self.api_key and self.cse_id):
+            return None
+
+        service = getattr(self._local, 'service', None)
+        if service is None:
             try:
-                self.service = google_build("customsearch", "v1", developerKey=self.api_key)
+                service = google_build("customsearch", "v1", developerKey=self.api_key)
+                self._local.service = service
             except Exception as e:
                 logger.error(f"Failed to initialize Google Search: {e}")
-    
+        return service
+
     def is_available(self) -> bool:
         return self.service is not None
-    
+
     def search(self, query: str, num_results: int = 10, start: int = 1) -> list[dict]:
         """Execute a single search query"""
-        if not self.is_available():
+        service = self._get_service()
+        if not service:
             return []
-        
+
+        cache = _get_search_cache()
+        key = SearchCache.make_key('google_cse', query, num_results, start)
+        cached = cache.get(key, CACHE_TTL_GOOGLE)
+        if cached is not None:
+            return cached
+
         try:
-            result = self.service.cse().list(
+            self._limiter.acquire()
+            result = service.cse().list(
                 q=query,
                 cx=self.cse_id,
                 num=min(num_results, 10),
                 start=start
             ).execute()
-            
-            return [{
+
+            results = [{
                 'title': item.get('title', ''),
                 'url': item.get('link', ''),
                 'snippet': item.get('snippet', ''),
                 'source': 'google_cse'
             } for item in result.get('items', [])]
-            
+
+            cache.put(key, results)
+            return results
+
         except Exception as e:
             logger.error(f"Google search error: {e}")
             return []
@@ -121,12 +280,13 @@ class GoogleCustomSearcher:
         all_results = []
         
         for start in range(1, min(max_results + 1, 101), 10):
+            # Pacing is handled by the token bucket inside search(), so
+            # cached pages come back instantly instead of sleeping
             results = self.search(query, num_results=10, start=start)
             if not results:
                 break
             all_results.extend(results)
-            time.sleep(0.5)
-        
+
         return all_results
 
 
@@ -145,6 +305,13 @@ class SerpApiSearcher:
     def __init__(self, api_key: str = None):
         self.api_key = api_key or os.getenv("SERPAPI_KEY", "")
         self.base_url = "https://serpapi.com/search"
+        # Reuse one connection pool across queries instead of paying a fresh
+        # TCP + TLS handshake per search
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._limiter = RateLimiter(rate=2.0, burst=2)
     
     def is_available(self) -> bool:
         return bool(self.api_key)
@@ -152,7 +319,13 @@ class SerpApiSearcher:
     def search(self, query: str, num_results: int = 20) -> list[dict]:
         if not self.is_available():
             return []
-        
+
+        cache = _get_search_cache()
+        key = SearchCache.make_key('serpapi', query, num_results)
+        cached = cache.get(key, CACHE_TTL_SERPAPI)
+        if cached is not None:
+            return cached
+
         try:
             params = {
                 "api_key": self.api_key,
@@ -160,17 +333,30 @@ class SerpApiSearcher:
                 "q": query,
                 "num": num_results,
             }
-            
-            response = requests.get(self.base_url, params=params, timeout=30)
+
+            self._limiter.acquire()
+            response = self.session.get(self.base_url, params=params, timeout=30)
+
+            if response.status_code == 429:
+                retry_after = float(response.headers.get('Retry-After', 5))
+                logger.warning(f"SerpApi rate limited, backing off {retry_after}s")
+                self._limiter.penalize(retry_after)
+                self._limiter.acquire()
+                response = self.session.get(self.base_url, params=params, timeout=30)
+
+            self._limiter.update_from_headers(response.headers)
             data = response.json()
-            
-            return [{
+
+            results = [{
                 'title': item.get('title', ''),
                 'url': item.get('link', ''),
                 'snippet': item.get('snippet', ''),
                 'source': 'serpapi'
             } for item in data.get('organic_results', [])]
-            
+
+            cache.put(key, results)
+            return results
+
         except Exception as e:
             logger.error(f"SerpApi error: {e}")
             return []
@@ -197,34 +383,50 @@ class DirectGoogleScraper:
     
     def search(self, query: str, num_results: int = 20) -> list[dict]:
         results = []
-        
+
         try:
             params = {'q': query, 'num': num_results}
             response = self.session.get(
                 "https://www.google.com/search",
                 params=params,
-                timeout=30
+                timeout=30,
+                stream=True
             )
-            
-            soup = BeautifulSoup(response.text, 'lxml')
-            
-            for div in soup.select('div.g'):
-                link = div.select_one('a[href^="http"]')
-                title = div.select_one('h3')
-                
-                if link and title:
-                    results.append({
-                        'title': title.get_text(),
-                        'url': link['href'],
-                        'snippet': '',
-                        'source': 'google_direct'
-                    })
-            
+
+            # Pull-parse the SERP as bytes stream in: we only need result
+            # titles (<h3> inside the result link), so there's no reason to
+            # decode the whole multi-hundred-KB page and build a full DOM
+            parser = etree.HTMLPullParser(events=('end',), tag='h3')
+            for chunk in response.iter_content(8192):
+                parser.feed(chunk)
+                for _, h3 in parser.read_events():
+                    link = self._result_link(h3)
+                    if link is not None:
+                        results.append({
+                            'title': ''.join(h3.itertext()),
+                            'url': link.get('href'),
+                            'snippet': '',
+                            'source': 'google_direct'
+                        })
+                if len(results) >= num_results:
+                    break  # Enough matches - skip parsing the page tail
+            response.close()
+
         except Exception as e:
             logger.error(f"Direct Google scrape error: {e}")
-        
+
         return results
 
+    @staticmethod
+    def _result_link(h3) -> Optional[etree._Element]:
+        """Find the enclosing result anchor for a SERP <h3> title"""
+        parent = h3.getparent()
+        while parent is not None:
+            if parent.tag == 'a' and (parent.get('href') or '').startswith('http'):
+                return parent
+            parent = parent.getparent()
+        return None
+
 
 class URLClassifier:
     """Classify discovered URLs by ATS type"""
@@ -245,59 +447,98 @@ class URLClassifier:
         'youtube.com', 'reddit.com', 'news.ycombinator.com',
         'glassdoor.com', 'indeed.com',  # Aggregators, harder to scrape
     ]
-    
+
+    SKIP_EXTENSIONS = ['.pdf', '.doc', '.png', '.jpg']
+
+    # Compiled once at class load - classify/filter_urls run per-URL over
+    # potentially thousands of results. Patterns are case-sensitive and
+    # matched against a pre-lowercased URL, which is cheaper than running
+    # every regex with IGNORECASE
+    _COMPILED_ATS = [
+        (ats_type, [re.compile(p) for p in patterns])
+        for ats_type, patterns in ATS_PATTERNS.items()
+    ]
+    _CAREERS_RE = re.compile(r'/careers?(/|$|\?)|/jobs?(/|$|\?)')
+    _SKIP_RE = re.compile('|'.join(re.escape(s) for s in SKIP_DOMAINS + SKIP_EXTENSIONS))
+
     @classmethod
     def classify(cls, url: str) -> dict:
         """Classify a URL and extract company slug"""
+        return cls._classify(url, url.lower())
+
+    @classmethod
+    def _classify(cls, url: str, url_lower: str) -> dict:
         result = {
             'type': 'unknown',
             'company_slug': None,
             'is_job_board': False,
             'url': url,
         }
-        
+
         # Check known ATS patterns
-        for ats_type, patterns in cls.ATS_PATTERNS.items():
+        for ats_type, patterns in cls._COMPILED_ATS:
             for pattern in patterns:
-                match = re.search(pattern, url, re.IGNORECASE)
+                match = pattern.search(url_lower)
                 if match:
                     result['type'] = ats_type
                     result['company_slug'] = match.group(1)
                     result['is_job_board'] = True
                     return result
-        
+
         # Check for generic careers page
-        if re.search(r'/careers?(/|$|\?)|/jobs?(/|$|\?)', url, re.IGNORECASE):
+        if cls._CAREERS_RE.search(url_lower):
             result['type'] = 'careers_page'
-            parsed = urlparse(url)
+            parsed = urlparse(url_lower)
             result['company_slug'] = parsed.netloc.replace('www.', '').split('.')[0]
-        
+
         return result
-    
+
     @classmethod
     def filter_urls(cls, urls: list[dict]) -> list[dict]:
         """Filter out irrelevant URLs and classify the rest"""
         filtered = []
-        
+
         for item in urls:
             url = item.get('url', '')
-            
-            # Skip irrelevant domains
-            if any(domain in url.lower() for domain in cls.SKIP_DOMAINS):
-                continue
-            
-            # Skip non-HTML
-            if any(ext in url.lower() for ext in ['.pdf', '.doc', '.png', '.jpg']):
+            # Lowercase once and reuse for the skip scan and every
+            # classification pattern
+            url_lower = url.lower()
+
+            # Skip irrelevant domains and non-HTML assets in one pass
+            if cls._SKIP_RE.search(url_lower):
                 continue
-            
-            classification = cls.classify(url)
+
+            classification = cls._classify(url, url_lower)
             if classification['type'] != 'unknown':
                 item['classification'] = classification
                 filtered.append(item)
-        
+
         return filtered
 
 
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize a URL for deduplication.
+
+    The same posting shows up with tracking params, trailing slashes and
+    fragments depending on which searcher found it; treating those as
+    distinct URLs bloats scraping and Supabase inserts downstream.
+    """
+    try:
+        p = urlparse(url)
+    except ValueError:
+        return url
+    query = '&'.join(
+        kv for kv in p.query.split('&')
+        # gh_src is Greenhouse's tracking param; gh_jid is the job id on
+        # embedded career pages and must survive canonicalization
+        if kv and not kv.startswith(('utm_', 'gh_src', 'gclid', 'fbclid', 'ref=', 'source='))
+    )
+    return urlunparse((
+        p.scheme.lower(), p.netloc.lower(), p.path.rstrip('/'), '', query, ''
+    ))
+
+
 class JobDiscovery:
     """
     Main discovery class - coordinates search and classification.
@@ -330,42 +571,64 @@ class JobDiscovery:
         self,
         queries: list[str] = None,
         max_results_per_query: int = 30,
-        delay_between_queries: float = 2.0
+        delay_between_queries: float = 2.0,
+        max_workers: int = 8
     ) -> list[dict]:
         """
         Run discovery searches and return classified URLs.
-        
+
         Args:
             queries: Search queries (uses defaults if None)
             max_results_per_query: Max results per query
-            delay_between_queries: Seconds between queries
-        
+            delay_between_queries: Seconds between queries (direct scraping only)
+            max_workers: Concurrent queries when using an API searcher
+
         Returns:
             List of classified job URLs
         """
         if queries is None:
             queries = DEFAULT_SEARCH_QUERIES
-        
-        all_results = {}  # Dedupe by URL
-        
-        for i, query in enumerate(queries):
-            logger.info(f"[{i+1}/{len(queries)}] Searching: {query}")
-            
+
+        all_results = {}  # Dedupe by canonicalized URL
+
+        def run_query(query: str) -> list[dict]:
             if hasattr(self.searcher, 'search_paginated'):
-                results = self.searcher.search_paginated(query, max_results_per_query)
-            else:
-                results = self.searcher.search(query, max_results_per_query)
-            
+                return self.searcher.search_paginated(query, max_results_per_query)
+            return self.searcher.search(query, max_results_per_query)
+
+        def merge(results: list[dict]):
             for result in results:
-                url = result['url']
-                if url not in all_results:
-                    all_results[url] = result
-            
-            logger.info(f"  Found {len(results)} results, {len(all_results)} total unique")
-            
-            if i < len(queries) - 1:
-                time.sleep(delay_between_queries)
-        
+                canon = canonicalize_url(result['url'])
+                if canon not in all_results:
+                    all_results[canon] = result
+
+        if self.searcher is self.direct:
+            # Direct Google scraping stays serial with delays; hitting
+            # google.com concurrently gets the IP blocked quickly
+            for i, query in enumerate(queries):
+                logger.info(f"[{i+1}/{len(queries)}] Searching: {query}")
+                results = run_query(query)
+                merge(results)
+                logger.info(f"  Found {len(results)} results, {len(all_results)} total unique")
+                if i < len(queries) - 1:
+                    time.sleep(delay_between_queries)
+        else:
+            # API searchers are pure I/O waits - run queries concurrently
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(run_query, q): q for q in queries}
+                for i, future in enumerate(as_completed(futures)):
+                    query = futures[future]
+                    try:
+                        results = future.result()
+                    except Exception as e:
+                        logger.error(f"Search failed for '{query}': {e}")
+                        continue
+                    merge(results)
+                    logger.info(
+                        f"[{i+1}/{len(queries)}] {query}: "
+                        f"{len(results)} results, {len(all_results)} total unique"
+                    )
+
         # Filter and classify
         classified = URLClassifier.filter_urls(list(all_results.values()))
         
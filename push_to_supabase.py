@@ -20,8 +20,10 @@ Environment variables required:
 
 import os
 import json
+import time
 import logging
 import argparse
+import functools
 from datetime import datetime
 from typing import Optional
 
@@ -35,19 +37,47 @@ from google_discovery import JobDiscovery, DEFAULT_SEARCH_QUERIES
 
 logger = logging.getLogger(__name__)
 
+# Max rows per upsert request - stays well under Supabase payload limits
+BATCH_SIZE = 500
+
+# How long cached user preferences stay fresh (seconds)
+PREFS_CACHE_TTL = 3600
+
+
+_supabase_client: Optional[Client] = None
+_discovery: Optional[JobDiscovery] = None
+
 
 def get_supabase_client() -> Client:
-    """Create Supabase client with service role key"""
+    """Create (or reuse) the Supabase client with service role key"""
+    global _supabase_client
+    if _supabase_client is not None:
+        return _supabase_client
+
     url = os.getenv("SUPABASE_URL")
     key = os.getenv("SUPABASE_SERVICE_KEY")
-    
+
     if not url or not key:
         raise ValueError(
             "Missing SUPABASE_URL or SUPABASE_SERVICE_KEY environment variables. "
             "Get these from your Supabase project settings."
         )
-    
-    return create_client(url, key)
+
+    _supabase_client = create_client(url, key)
+    return _supabase_client
+
+
+def get_discovery() -> JobDiscovery:
+    """Create (or reuse) the JobDiscovery instance.
+
+    Constructing JobDiscovery rebuilds the Google API service, which
+    fetches the discovery document over HTTPS - no reason to pay that
+    on every scheduled pipeline run.
+    """
+    global _discovery
+    if _discovery is None:
+        _discovery = JobDiscovery()
+    return _discovery
 
 
 def push_jobs_to_supabase(
@@ -67,11 +97,12 @@ def push_jobs_to_supabase(
         Stats dict with inserted/skipped counts
     """
     stats = {"inserted": 0, "skipped": 0, "errors": 0}
-    
+
+    discovered_at = datetime.utcnow().isoformat()
+    records = []
     for job in jobs:
         classification = job.get("classification", {})
-        
-        record = {
+        records.append({
             "user_id": user_id,
             "url": job.get("url", ""),
             "title": job.get("title", "Unknown"),
@@ -79,33 +110,48 @@ def push_jobs_to_supabase(
             "company_slug": classification.get("company_slug"),
             "ats_type": classification.get("type"),
             "source": job.get("source", "google_discovery"),
-            "discovered_at": datetime.utcnow().isoformat(),
-        }
-        
+            "discovered_at": discovered_at,
+        })
+
+    # Batch upserts - one HTTP round trip per chunk instead of one per job
+    for start in range(0, len(records), BATCH_SIZE):
+        chunk = records[start:start + BATCH_SIZE]
         try:
             # Upsert to handle duplicates gracefully
             result = supabase.table("discovered_jobs").upsert(
-                record,
+                chunk,
                 on_conflict="user_id,url"
             ).execute()
-            
-            if result.data:
-                stats["inserted"] += 1
-            else:
-                stats["skipped"] += 1
-                
+
+            inserted = len(result.data) if result.data else 0
+            stats["inserted"] += inserted
+            stats["skipped"] += len(chunk) - inserted
+
         except Exception as e:
-            logger.error(f"Error inserting job {job.get('url')}: {e}")
-            stats["errors"] += 1
-    
+            logger.error(f"Error inserting batch of {len(chunk)} jobs: {e}")
+            stats["errors"] += len(chunk)
+
     return stats
 
 
 def get_user_preferences(user_id: str, supabase: Client) -> Optional[dict]:
-    """Fetch user's job preferences from Supabase"""
+    """
+    Fetch user's job preferences from Supabase.
+
+    Memoized per TTL window: daemon runs hit the same profiles row every
+    iteration, and preferences change far less often than the pipeline runs.
+    """
+    time_bucket = int(time.time() // PREFS_CACHE_TTL)
+    return _fetch_preferences(user_id, time_bucket, supabase)
+
+
+@functools.lru_cache(maxsize=256)
+def _fetch_preferences(user_id: str, time_bucket: int, supabase: Client) -> Optional[dict]:
+    # time_bucket is only part of the cache key - it rotates the key each
+    # TTL window so a fresh fetch happens at most once per window
     try:
         result = supabase.table("profiles").select(
-            "target_roles, work_type, location_zip, search_radius_miles"
+            "target_roles, work_type, location_zip, search_radius_miles, cached_queries"
         ).eq("user_id", user_id).single().execute()
         
         return result.data
@@ -166,13 +212,24 @@ def run_discovery_pipeline(
     
     if custom_queries:
         queries = custom_queries
+    elif preferences and preferences.get("cached_queries"):
+        # Precomputed at a previous run; a profile trigger nulls this out
+        # whenever the underlying preferences change
+        queries = preferences["cached_queries"]
     else:
         queries = build_search_queries(preferences)
+        if preferences:
+            try:
+                supabase.table("profiles").update(
+                    {"cached_queries": queries}
+                ).eq("user_id", user_id).execute()
+            except Exception as e:
+                logger.warning(f"Could not cache queries for user {user_id}: {e}")
     
     logger.info(f"Running discovery with {len(queries)} queries for user {user_id}")
     
     # Discover jobs
-    discovery = JobDiscovery()
+    discovery = get_discovery()
     jobs = discovery.discover(
         queries=queries,
         max_results_per_query=max_results,
@@ -29,7 +29,9 @@ Environment Variables:
     SERPAPI_KEY        - Alternative to Google CSE
 """
 
+import io
 import os
+import re
 import sys
 import json
 import time
@@ -37,22 +39,39 @@ import hashlib
 import argparse
 import logging
 import sqlite3
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from dataclasses import dataclass, asdict
 from typing import Optional
+from urllib.parse import urlparse
 
 # Local imports
-from google_discovery import JobDiscovery, URLClassifier, DEFAULT_SEARCH_QUERIES
+from google_discovery import JobDiscovery, URLClassifier, DEFAULT_SEARCH_QUERIES, canonicalize_url
 
 # Third-party
+import orjson
 import requests
+import xxhash
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
+
+# selectolax wraps the Lexbor C parser - an order of magnitude faster than
+# bs4+lxml for the few selectors the scrapers need. bs4 stays as a fallback
+# for deployments where the C extension won't build
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    import soupsieve  # Ships with bs4; used to precompile fallback selectors
+    SELECTOLAX_AVAILABLE = False
 import anthropic
 from docx import Document
 from docx.shared import Inches, Pt
 from docx.enum.text import WD_ALIGN_PARAGRAPH
-import schedule
 
 # Setup logging
 logging.basicConfig(
@@ -82,7 +101,9 @@ CONFIG = {
 }
 
 
-@dataclass
+# slots=True: no per-instance __dict__, so thousands of Job objects in a
+# big run cost a flat array of fields instead of a dict each
+@dataclass(slots=True)
 class Job:
     id: str
     title: str
@@ -98,7 +119,7 @@ class Job:
     status: str = "new"
 
 
-@dataclass
+@dataclass(slots=True)
 class MasterResume:
     name: str
     email: str
@@ -115,10 +136,34 @@ class MasterResume:
 # DATABASE
 # =============================================================================
 
+# Serializes DB access when run_processing fans work out across threads
+_db_lock = threading.Lock()
+
+_conn: Optional[sqlite3.Connection] = None
+
+
 def init_db() -> sqlite3.Connection:
-    conn = sqlite3.connect(CONFIG["db_path"])
+    """Open (or reuse) the process-wide connection.
+
+    Daemon cycles call this every iteration; reusing one connection
+    skips reconnecting and re-running the PRAGMAs each time.
+    """
+    global _conn
+    if _conn is not None:
+        return _conn
+
+    conn = sqlite3.connect(CONFIG["db_path"], check_same_thread=False)
+    conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
-    
+
+    # WAL avoids a full-file fsync per write and lets readers coexist with
+    # the writer; NORMAL skips the per-commit fsync that autocommit mode
+    # was paying on every single INSERT
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS jobs (
             id TEXT PRIMARY KEY,
@@ -144,43 +189,94 @@ def init_db() -> sqlite3.Connection:
             url TEXT PRIMARY KEY,
             discovered_at TEXT,
             classification TEXT,
-            processed INTEGER DEFAULT 0
+            processed INTEGER DEFAULT 0,
+            canonical_hash TEXT
         )
     """)
-    
+    # Existing databases predate canonical_hash
+    try:
+        cursor.execute("ALTER TABLE discovered_urls ADD COLUMN canonical_hash TEXT")
+    except sqlite3.OperationalError:
+        pass
+    cursor.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_discovered_canonical
+        ON discovered_urls(canonical_hash)
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS llm_cache (
+            prompt_hash TEXT PRIMARY KEY,
+            response TEXT,
+            created_at REAL
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS analysis_by_desc (
+            desc_hash TEXT PRIMARY KEY,
+            analysis_json TEXT
+        )
+    """)
+
     conn.commit()
+    _conn = conn
     return conn
 
 
-def url_seen(conn: sqlite3.Connection, url: str) -> bool:
-    cursor = conn.cursor()
-    cursor.execute("SELECT 1 FROM discovered_urls WHERE url = ?", (url,))
-    return cursor.fetchone() is not None
+def canonical_hash(url: str) -> str:
+    """Content-addressable key for a URL: hash of its canonical form, so
+    the same posting under different tracking params dedupes to one row"""
+    return hashlib.sha256(canonicalize_url(url).encode()).hexdigest()
 
 
-def save_discovered(conn: sqlite3.Connection, url: str, classification: dict):
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT OR IGNORE INTO discovered_urls (url, discovered_at, classification)
-        VALUES (?, ?, ?)
-    """, (url, datetime.now().isoformat(), json.dumps(classification)))
-    conn.commit()
+# In-process membership cache so url_seen doesn't hit SQLite once per
+# discovered URL (hundreds of SELECTs per run). Holds canonical hashes,
+# loaded lazily from discovered_urls and kept in sync by save_discovered_many
+_seen_urls: Optional[set] = None
+
+
+def url_seen(conn: sqlite3.Connection, url: str) -> bool:
+    global _seen_urls
+    with _db_lock:
+        if _seen_urls is None:
+            cursor = conn.cursor()
+            cursor.execute("SELECT url, canonical_hash FROM discovered_urls")
+            # Rows written before the canonical_hash column get hashed here
+            _seen_urls = {ch or canonical_hash(u) for u, ch in cursor.fetchall()}
+    return canonical_hash(url) in _seen_urls
+
+
+def save_discovered_many(conn: sqlite3.Connection, items: list[tuple[str, dict]]):
+    """Insert a batch of (url, classification) pairs in one transaction"""
+    now = datetime.now().isoformat()
+    rows = [(url, now, orjson.dumps(classification).decode(), canonical_hash(url))
+            for url, classification in items]
+    with _db_lock:
+        with conn:
+            conn.executemany("""
+                INSERT OR IGNORE INTO discovered_urls (url, discovered_at, classification, canonical_hash)
+                VALUES (?, ?, ?, ?)
+            """, rows)
+        if _seen_urls is not None:
+            _seen_urls.update(row[3] for row in rows)
 
 
 def save_job(conn: sqlite3.Connection, job: Job, resume_path: str = None, cl_path: str = None):
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT OR REPLACE INTO jobs 
-        (id, title, company, url, location, description, requirements, keywords,
-         discovered_at, match_score, source, status, resume_path, cover_letter_path)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
-        job.id, job.title, job.company, job.url, job.location, job.description,
-        json.dumps(job.requirements), json.dumps(job.keywords),
-        job.discovered_at, job.match_score, job.source, job.status,
-        resume_path, cl_path
-    ))
-    conn.commit()
+    with _db_lock:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT OR REPLACE INTO jobs
+            (id, title, company, url, location, description, requirements, keywords,
+             discovered_at, match_score, source, status, resume_path, cover_letter_path)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            job.id, job.title, job.company, job.url, job.location, job.description,
+            orjson.dumps(job.requirements).decode(), orjson.dumps(job.keywords).decode(),
+            job.discovered_at, job.match_score, job.source, job.status,
+            resume_path, cl_path
+        ))
+    # No commit here - callers commit per pass (the mark_processed_many
+    # transaction flushes save_job inserts along with the processed flags)
 
 
 def get_pending_urls(conn: sqlite3.Connection, limit: int = 50) -> list[dict]:
@@ -191,93 +287,199 @@ def get_pending_urls(conn: sqlite3.Connection, limit: int = 50) -> list[dict]:
         ORDER BY discovered_at DESC 
         LIMIT ?
     """, (limit,))
-    return [{'url': row[0], 'classification': json.loads(row[1])} for row in cursor.fetchall()]
+    # orjson decodes in native code - this loop is pure JSON work for
+    # hundreds of rows at the start of every processing pass
+    return [{'url': row[0], 'classification': orjson.loads(row[1])} for row in cursor.fetchall()]
 
 
-def mark_processed(conn: sqlite3.Connection, url: str):
-    cursor = conn.cursor()
-    cursor.execute("UPDATE discovered_urls SET processed = 1 WHERE url = ?", (url,))
-    conn.commit()
+def mark_processed_many(conn: sqlite3.Connection, urls: list[str]):
+    """Flag a batch of URLs processed in one transaction"""
+    if not urls:
+        return
+    with _db_lock:
+        with conn:
+            conn.executemany(
+                "UPDATE discovered_urls SET processed = 1 WHERE url = ?",
+                [(url,) for url in urls]
+            )
 
 
 # =============================================================================
 # SCRAPERS
 # =============================================================================
 
+def parse_html(content: bytes):
+    """Parse HTML with Lexbor when available, bs4+lxml otherwise"""
+    if SELECTOLAX_AVAILABLE:
+        return LexborHTMLParser(content)
+    return BeautifulSoup(content, 'lxml')
+
+
+# Selector candidates for pages without a known ATS layout, in order of
+# preference. Module-level so they're built once, not per page
+TITLE_SELECTORS = ('h1', '.job-title', '.posting-title', '[class*="title"]')
+CONTENT_SELECTORS = ('main', 'article', '.job-description', '[class*="description"]', '.content')
+
+# bs4 fallback path: selector strings compiled once instead of re-parsed
+# by soupsieve on every select_one call
+_compiled_selectors: dict = {}
+
+
+def css_first(tree, selector: str):
+    """First node matching a CSS selector, for either parser"""
+    if SELECTOLAX_AVAILABLE:
+        return tree.css_first(selector)
+    compiled = _compiled_selectors.get(selector)
+    if compiled is None:
+        compiled = _compiled_selectors[selector] = soupsieve.compile(selector)
+    return next(compiled.iselect(tree), None)
+
+
+def node_text(node, separator: str = '') -> str:
+    """Stripped text content of a node, for either parser"""
+    if SELECTOLAX_AVAILABLE:
+        return node.text(separator=separator).strip()
+    return node.get_text(separator).strip()
+
+
 class Scraper:
+    # Job postings are typically well under 200 KB; anything bigger is a
+    # rogue page that would balloon parser memory
+    MAX_PAGE_BYTES = 2_000_000
+
+    # Minimum spacing between requests to the same host - politeness is
+    # per-host, so fetches against different ATS domains run in parallel
+    HOST_DELAY = 2.0
+
     def __init__(self):
         self.session = requests.Session()
         self.session.headers.update({
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+            # No "br" here: nothing installs a brotli decoder, and urllib3
+            # passes undecodable bodies through as compressed bytes
+            "Accept-Encoding": "gzip, deflate",
         })
-    
-    def get_page(self, url: str) -> Optional[BeautifulSoup]:
+        # Pool sized for the processing thread pool, with retries so a
+        # transient 5xx or dropped connection doesn't sink the whole job
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset(['GET']),
+            ),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._host_locks: dict[str, threading.Lock] = {}
+        self._host_last: dict[str, float] = {}
+        self._throttle_lock = threading.Lock()
+
+    def _throttle(self, url: str):
+        """Block until this host is clear for another request"""
+        host = urlparse(url).netloc
+        with self._throttle_lock:
+            lock = self._host_locks.setdefault(host, threading.Lock())
+        with lock:
+            wait = self.HOST_DELAY - (time.monotonic() - self._host_last.get(host, 0.0))
+            if wait > 0:
+                time.sleep(wait)
+            self._host_last[host] = time.monotonic()
+
+    def get_page(self, url: str):
+        """Fetch a URL and return a parsed tree (Lexbor or bs4), or None"""
         try:
-            response = self.session.get(url, timeout=30)
+            self._throttle(url)
+            response = self.session.get(url, timeout=30, stream=True)
             response.raise_for_status()
-            return BeautifulSoup(response.text, 'lxml')
+
+            content_type = response.headers.get('Content-Type', '')
+            if content_type and 'html' not in content_type:
+                logger.warning(f"Skipping non-HTML response ({content_type}): {url}")
+                response.close()
+                return None
+
+            length = response.headers.get('Content-Length')
+            if length and int(length) > self.MAX_PAGE_BYTES:
+                logger.warning(f"Skipping oversized page ({length} bytes): {url}")
+                response.close()
+                return None
+
+            chunks = []
+            total = 0
+            for chunk in response.iter_content(65536):
+                total += len(chunk)
+                if total > self.MAX_PAGE_BYTES:
+                    logger.warning(f"Truncating page at {self.MAX_PAGE_BYTES} bytes: {url}")
+                    response.close()
+                    break
+                chunks.append(chunk)
+
+            return parse_html(b''.join(chunks))
         except Exception as e:
             logger.error(f"Failed to fetch {url}: {e}")
             return None
-    
+
     def get_greenhouse_job(self, url: str) -> Optional[dict]:
-        soup = self.get_page(url)
-        if not soup:
+        tree = self.get_page(url)
+        if not tree:
             return None
-        
-        title = soup.select_one('.app-title')
-        location = soup.select_one('.location')
-        content = soup.select_one('#content')
-        
+
+        title = css_first(tree, '.app-title')
+        location = css_first(tree, '.location')
+        content = css_first(tree, '#content')
+
         return {
-            "title": title.text.strip() if title else "Unknown",
-            "location": location.text.strip() if location else "Remote",
-            "description": content.get_text('\n').strip() if content else "",
+            "title": node_text(title) if title else "Unknown",
+            "location": node_text(location) if location else "Remote",
+            "description": node_text(content, '\n') if content else "",
         }
-    
+
     def get_lever_job(self, url: str) -> Optional[dict]:
-        soup = self.get_page(url)
-        if not soup:
+        tree = self.get_page(url)
+        if not tree:
             return None
-        
-        title = soup.select_one('.posting-headline h2')
-        location = soup.select_one('.location')
-        content = soup.select_one('.content')
-        
+
+        title = css_first(tree, '.posting-headline h2')
+        location = css_first(tree, '.location')
+        content = css_first(tree, '.content')
+
         return {
-            "title": title.text.strip() if title else "Unknown",
-            "location": location.text.strip() if location else "Remote",
-            "description": content.get_text('\n').strip() if content else "",
+            "title": node_text(title) if title else "Unknown",
+            "location": node_text(location) if location else "Remote",
+            "description": node_text(content, '\n') if content else "",
         }
-    
+
     def get_generic_job(self, url: str) -> Optional[dict]:
-        soup = self.get_page(url)
-        if not soup:
+        tree = self.get_page(url)
+        if not tree:
             return None
-        
+
         # Find title
         title = None
-        for sel in ['h1', '.job-title', '.posting-title', '[class*="title"]']:
-            el = soup.select_one(sel)
+        for sel in TITLE_SELECTORS:
+            el = css_first(tree, sel)
             if el:
-                title = el.text.strip()
+                title = node_text(el)
                 break
-        
+
         # Find content
         content = None
-        for sel in ['main', 'article', '.job-description', '[class*="description"]', '.content']:
-            el = soup.select_one(sel)
+        for sel in CONTENT_SELECTORS:
+            el = css_first(tree, sel)
             if el:
                 content = el
                 break
-        
+
         if not content:
-            content = soup.body
-        
+            content = tree.body
+
         return {
             "title": title or "Unknown Position",
             "location": "Remote",
-            "description": content.get_text('\n').strip() if content else "",
+            "description": node_text(content, '\n') if content else "",
         }
     
     def get_job(self, url: str, ats_type: str) -> Optional[dict]:
@@ -294,9 +496,92 @@ class Scraper:
 # AI ANALYSIS
 # =============================================================================
 
-def analyze_job(client: anthropic.Anthropic, description: str) -> dict:
-    """Analyze job description with Claude"""
-    prompt = f"""Analyze this job description. Return JSON only:
+MODEL = "claude-sonnet-4-20250514"
+
+# Reposts and mirrored boards surface identical prompts across runs for a
+# while; beyond a week a fresh response is cheap insurance
+LLM_CACHE_TTL = 7 * 86400
+
+
+def prompt_cache_key(kind: str, content) -> str:
+    """Cache key for an LLM call: function name + hash of the exact prompt"""
+    if not isinstance(content, str):
+        content = json.dumps(content, sort_keys=True)
+    return f"{kind}:{hashlib.sha256(content.encode()).hexdigest()}"
+
+
+def llm_cache_get(conn: sqlite3.Connection, key: str) -> Optional[str]:
+    with _db_lock:
+        row = conn.execute(
+            "SELECT response FROM llm_cache WHERE prompt_hash = ? AND created_at > ?",
+            (key, time.time() - LLM_CACHE_TTL)
+        ).fetchone()
+    return row[0] if row else None
+
+
+def llm_cache_put(conn: sqlite3.Connection, key: str, response: str):
+    with _db_lock:
+        conn.execute(
+            "INSERT OR REPLACE INTO llm_cache (prompt_hash, response, created_at) VALUES (?, ?, ?)",
+            (key, response, time.time())
+        )
+        conn.commit()
+
+
+def desc_hash(description: str) -> str:
+    """Whitespace/case-normalized content hash of a job description.
+
+    ATS boards mirror identical descriptions across multiple URLs; hashing
+    the content lets those share one analysis regardless of the URL or any
+    prompt-template changes.
+    """
+    normalized = re.sub(r'\s+', ' ', description).strip().lower()
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def get_analysis_by_desc(conn: sqlite3.Connection, dh: str) -> Optional[dict]:
+    with _db_lock:
+        row = conn.execute(
+            "SELECT analysis_json FROM analysis_by_desc WHERE desc_hash = ?", (dh,)
+        ).fetchone()
+    return orjson.loads(row[0]) if row else None
+
+
+def save_analysis_by_desc(conn: sqlite3.Connection, dh: str, analysis: dict):
+    with _db_lock:
+        conn.execute(
+            "INSERT OR REPLACE INTO analysis_by_desc (desc_hash, analysis_json) VALUES (?, ?)",
+            (dh, orjson.dumps(analysis).decode())
+        )
+        conn.commit()
+
+
+# Anchored so only fences at the edges are trimmed - no need to scan the
+# whole multi-KB body twice with str.replace. Handles single-line fenced
+# responses (no newline after the opening fence) too.
+_FENCE_RE = re.compile(r'^```[\w-]*[ \t]*\n?|\n?```\s*$')
+
+
+def parse_json_response(text: str) -> dict:
+    """Parse a JSON response, tolerating markdown code fences"""
+    return orjson.loads(_FENCE_RE.sub('', text.strip()))
+
+
+def trim_to_word(text: str, max_chars: int = 8000) -> str:
+    """Truncate text at the last word boundary before max_chars.
+
+    A plain slice can cut mid-word (or mid multi-byte grapheme), which
+    also makes cache keys for near-identical descriptions diverge on
+    where the cut happens to land.
+    """
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind(' ', 0, max_chars)
+    return text[:cut] if cut > 0 else text[:max_chars]
+
+
+def build_analyze_prompt(description: str) -> str:
+    return f"""Analyze this job description. Return JSON only:
 
 {{
     "required_skills": ["skill1", "skill2"],
@@ -308,62 +593,104 @@ def analyze_job(client: anthropic.Anthropic, description: str) -> dict:
 }}
 
 Job Description:
-{description[:8000]}
+{trim_to_word(description)}
 
 JSON only, no other text:"""
 
+
+def analyze_job(client: anthropic.Anthropic, description: str,
+                conn: sqlite3.Connection = None) -> dict:
+    """Analyze job description with Claude"""
+    prompt = build_analyze_prompt(description)
+    key = prompt_cache_key('analyze', prompt)
     try:
+        if conn is not None:
+            cached = llm_cache_get(conn, key)
+            if cached is not None:
+                return parse_json_response(cached)
+
         response = client.messages.create(
-            model="claude-sonnet-4-20250514",
+            model=MODEL,
             max_tokens=1500,
             messages=[{"role": "user", "content": prompt}]
         )
         text = response.content[0].text
-        text = text.replace('```json', '').replace('```', '').strip()
-        return json.loads(text)
+        # Parse before caching - a malformed response must not be served
+        # from the cache for the whole TTL
+        result = parse_json_response(text)
+        if conn is not None:
+            llm_cache_put(conn, key, text)
+        return result
     except Exception as e:
         logger.error(f"Analysis error: {e}")
         return {}
 
 
+@functools.lru_cache(maxsize=4)
+def _resume_skills_lower(skills: tuple[str, ...]) -> frozenset:
+    """Lowercased resume skills - computed once per distinct skills list,
+    not rebuilt on every calculate_match call"""
+    return frozenset(s.lower() for s in skills)
+
+
 def calculate_match(analysis: dict, resume: MasterResume) -> float:
     """Calculate match score between job and resume"""
     if not analysis:
         return 0.0
-    
+
+    resume_skills = _resume_skills_lower(tuple(resume.skills))
+
+    def matches(skill: str) -> bool:
+        skill_lower = skill.lower()
+        # O(1) exact hit first - the common case - then fall back to the
+        # substring scan for partial matches like "sql" vs "postgresql"
+        if skill_lower in resume_skills:
+            return True
+        return any(skill_lower in rs or rs in skill_lower for rs in resume_skills)
+
     score = 0
     max_score = 0
-    
-    resume_skills = [s.lower() for s in resume.skills]
-    
+
     for skill in analysis.get('required_skills', []):
         max_score += 2
-        if any(skill.lower() in rs or rs in skill.lower() for rs in resume_skills):
+        if matches(skill):
             score += 2
-    
+
     for skill in analysis.get('preferred_skills', []):
         max_score += 1
-        if any(skill.lower() in rs or rs in skill.lower() for rs in resume_skills):
+        if matches(skill):
             score += 1
-    
+
     if analysis.get('remote_type') == 'fully_remote':
         score += 2
         max_score += 2
-    
+
     return score / max_score if max_score > 0 else 0.5
 
 
-def tailor_resume(client: anthropic.Anthropic, resume: MasterResume, 
-                  analysis: dict, job_title: str, company: str) -> dict:
-    """Generate tailored resume content"""
-    prompt = f"""Tailor this resume for the job. Return JSON only.
+# The master resume is immutable between load_resume() calls; serialize it
+# once instead of deep-copying via asdict and re-encoding for every prompt.
+# load_resume resets this so daemon cycles pick up edits to the file.
+_resume_json_cache: Optional[str] = None
 
-Resume:
-{json.dumps(asdict(resume), indent=2)}
 
-Job: {job_title} at {company}
-Requirements: {json.dumps(analysis.get('required_skills', []))}
-Keywords: {json.dumps(analysis.get('keywords', []))}
+def resume_as_json(resume: MasterResume) -> str:
+    global _resume_json_cache
+    if _resume_json_cache is None:
+        _resume_json_cache = json.dumps(asdict(resume), indent=2)
+    return _resume_json_cache
+
+
+def build_tailor_prompt(resume: MasterResume, analysis: dict,
+                        job_title: str, company: str) -> list[dict]:
+    # The instruction header, resume JSON and output schema are identical
+    # for every job, so they form a cache_control prefix: across a run the
+    # cached tokens bill at ~10% and skip re-processing. Only the per-job
+    # tail varies.
+    static = f"""Tailor this resume for the job described at the end. Return JSON only.
+
+Resume:
+{resume_as_json(resume)}
 
 Return JSON:
 {{
@@ -374,60 +701,159 @@ Return JSON:
     "skills": ["reordered", "skills", "list"]
 }}
 
-JSON only:"""
+JSON only."""
+
+    tail = f"""Job: {job_title} at {company}
+Requirements: {json.dumps(analysis.get('required_skills', []))}
+Keywords: {json.dumps(analysis.get('keywords', []))}"""
+
+    return [
+        {"type": "text", "text": static, "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": tail},
+    ]
+
 
+def tailor_resume(client: anthropic.Anthropic, resume: MasterResume,
+                  analysis: dict, job_title: str, company: str,
+                  conn: sqlite3.Connection = None) -> dict:
+    """Generate tailored resume content"""
+    prompt = build_tailor_prompt(resume, analysis, job_title, company)
+    key = prompt_cache_key('tailor', prompt)
     try:
+        if conn is not None:
+            cached = llm_cache_get(conn, key)
+            if cached is not None:
+                return parse_json_response(cached)
+
         response = client.messages.create(
-            model="claude-sonnet-4-20250514",
+            model=MODEL,
             max_tokens=2500,
             messages=[{"role": "user", "content": prompt}]
         )
         text = response.content[0].text
-        text = text.replace('```json', '').replace('```', '').strip()
-        return json.loads(text)
+        # Parse before caching, as in analyze_job
+        result = parse_json_response(text)
+        if conn is not None:
+            llm_cache_put(conn, key, text)
+        return result
     except Exception as e:
         logger.error(f"Resume tailoring error: {e}")
         return {}
 
 
-def generate_cover_letter(client: anthropic.Anthropic, resume: MasterResume,
-                          analysis: dict, job_title: str, company: str) -> str:
-    """Generate cover letter"""
-    prompt = f"""Write a cover letter (3-4 paragraphs).
+def build_cover_letter_prompt(resume: MasterResume, analysis: dict,
+                              job_title: str, company: str) -> list[dict]:
+    # Same split as build_tailor_prompt: candidate details are the stable
+    # cacheable prefix, the job-specific lines vary per request
+    static = f"""Write a cover letter (3-4 paragraphs) for the job described at the end.
 
 Candidate: {resume.name}, {resume.experience[0]['title'] if resume.experience else 'Professional'}
-Job: {job_title} at {company}
-Key Skills: {', '.join(resume.skills[:8])}
+Key Skills: {', '.join(resume.skills[:8])}"""
+
+    tail = f"""Job: {job_title} at {company}
 Requirements: {', '.join(analysis.get('required_skills', [])[:5])}
 
 Write the letter (no JSON, just the text):"""
 
+    return [
+        {"type": "text", "text": static, "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": tail},
+    ]
+
+
+def generate_cover_letter(client: anthropic.Anthropic, resume: MasterResume,
+                          analysis: dict, job_title: str, company: str,
+                          conn: sqlite3.Connection = None) -> str:
+    """Generate cover letter"""
+    prompt = build_cover_letter_prompt(resume, analysis, job_title, company)
+    key = prompt_cache_key('cover', prompt)
+    if conn is not None:
+        cached = llm_cache_get(conn, key)
+        if cached is not None:
+            return cached.strip()
+
     try:
         response = client.messages.create(
-            model="claude-sonnet-4-20250514",
+            model=MODEL,
             max_tokens=1200,
             messages=[{"role": "user", "content": prompt}]
         )
-        return response.content[0].text.strip()
+        text = response.content[0].text
+        if conn is not None:
+            llm_cache_put(conn, key, text)
+        return text.strip()
     except Exception as e:
         logger.error(f"Cover letter error: {e}")
         return ""
 
 
+def run_message_batch(client: anthropic.Anthropic, requests: list[dict],
+                      poll_interval: float = 15.0,
+                      max_wait: float = 3600.0) -> dict[str, str]:
+    """
+    Submit a Message Batches request and block until it completes.
+
+    Returns {custom_id: response text} for the requests that succeeded;
+    failures (including API errors and batches that don't finish within
+    max_wait) are logged and omitted so callers can skip those jobs.
+    """
+    if not requests:
+        return {}
+
+    try:
+        batch = client.messages.batches.create(requests=requests)
+        logger.info(f"Submitted batch {batch.id} with {len(requests)} requests")
+
+        deadline = time.time() + max_wait
+        while batch.processing_status != "ended":
+            if time.time() >= deadline:
+                logger.error(f"Batch {batch.id} still {batch.processing_status} "
+                             f"after {max_wait:.0f}s, giving up")
+                return {}
+            time.sleep(poll_interval)
+            batch = client.messages.batches.retrieve(batch.id)
+
+        results = {}
+        for entry in client.messages.batches.results(batch.id):
+            if entry.result.type == "succeeded":
+                results[entry.custom_id] = entry.result.message.content[0].text
+            else:
+                logger.error(f"Batch request {entry.custom_id} failed: {entry.result.type}")
+        return results
+    except Exception as e:
+        logger.error(f"Batch error: {e}")
+        return {}
+
+
 # =============================================================================
 # DOCUMENT GENERATION
 # =============================================================================
 
-def create_resume_docx(content: dict, resume: MasterResume, path: Path):
-    """Create tailored resume as .docx"""
+def _build_template(vertical, horizontal) -> bytes:
+    """Pre-serialize an empty document with margins applied.
+
+    Reloading these bytes is cheaper than constructing a fresh Document
+    and re-applying section setup for every generated file.
+    """
     doc = Document()
-    
     for section in doc.sections:
-        section.top_margin = Inches(0.5)
-        section.bottom_margin = Inches(0.5)
-        section.left_margin = Inches(0.6)
-        section.right_margin = Inches(0.6)
-    
+        section.top_margin = vertical
+        section.bottom_margin = vertical
+        section.left_margin = horizontal
+        section.right_margin = horizontal
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+_RESUME_TEMPLATE_BYTES = _build_template(Inches(0.5), Inches(0.6))
+_COVER_LETTER_TEMPLATE_BYTES = _build_template(Inches(1), Inches(1))
+
+
+def create_resume_docx(content: dict, resume: MasterResume, path: Path):
+    """Create tailored resume as .docx"""
+    doc = Document(io.BytesIO(_RESUME_TEMPLATE_BYTES))
+
     # Header
     name_p = doc.add_paragraph()
     name_p.add_run(resume.name).bold = True
@@ -480,14 +906,8 @@ def create_resume_docx(content: dict, resume: MasterResume, path: Path):
 def create_cover_letter_docx(letter: str, resume: MasterResume, 
                               job_title: str, company: str, path: Path):
     """Create cover letter as .docx"""
-    doc = Document()
-    
-    for section in doc.sections:
-        section.top_margin = Inches(1)
-        section.bottom_margin = Inches(1)
-        section.left_margin = Inches(1)
-        section.right_margin = Inches(1)
-    
+    doc = Document(io.BytesIO(_COVER_LETTER_TEMPLATE_BYTES))
+
     doc.add_paragraph(datetime.now().strftime("%B %d, %Y"))
     doc.add_paragraph()
     doc.add_paragraph(f"Re: {job_title} Position at {company}")
@@ -510,25 +930,29 @@ def create_cover_letter_docx(letter: str, resume: MasterResume,
 # =============================================================================
 
 def load_resume() -> MasterResume:
+    global _resume_json_cache
     path = CONFIG["master_resume_path"]
     if path.exists():
         with open(path) as f:
+            # Drop the cached serialization so a fresh load (daemon
+            # cycles re-read the file) is reflected in prompts
+            _resume_json_cache = None
             return MasterResume(**json.load(f))
     else:
         logger.error(f"Resume not found at {path}")
         sys.exit(1)
 
 
+# Compiled once - filter_by_title runs per scraped job, and a single
+# alternation scans the title in one C-level pass instead of one Python
+# substring check per keyword
+_EXCLUDE_RE = re.compile('|'.join(map(re.escape, CONFIG['exclude_keywords'])), re.IGNORECASE)
+_TARGET_RE = re.compile('|'.join(map(re.escape, CONFIG['target_roles'])), re.IGNORECASE)
+
+
 def filter_by_title(title: str) -> bool:
     """Check if job title matches our targets"""
-    title_lower = title.lower()
-    
-    # Check exclusions
-    if any(exc in title_lower for exc in CONFIG['exclude_keywords']):
-        return False
-    
-    # Check matches
-    return any(role in title_lower for role in CONFIG['target_roles'])
+    return not _EXCLUDE_RE.search(title) and bool(_TARGET_RE.search(title))
 
 
 def process_job_url(conn: sqlite3.Connection, client: anthropic.Anthropic,
@@ -552,8 +976,13 @@ def process_job_url(conn: sqlite3.Connection, client: anthropic.Anthropic,
         logger.info(f"Skipping (title mismatch): {details['title']}")
         return None
     
-    # Analyze with AI
-    analysis = analyze_job(client, details['description'])
+    # Analyze with AI - identical descriptions reuse their prior analysis
+    dh = desc_hash(details['description'])
+    analysis = get_analysis_by_desc(conn, dh)
+    if analysis is None:
+        analysis = analyze_job(client, details['description'], conn)
+        if analysis:
+            save_analysis_by_desc(conn, dh, analysis)
     
     # Calculate match
     match_score = calculate_match(analysis, resume)
@@ -563,9 +992,9 @@ def process_job_url(conn: sqlite3.Connection, client: anthropic.Anthropic,
         return None
     
     logger.info(f"Match {match_score:.0%}: {details['title']} at {company}")
-    
-    # Create job record
-    job_id = hashlib.md5(url.encode()).hexdigest()[:12]
+
+    # Create job record - xxh3 is a non-cryptographic hash, plenty for an id
+    job_id = xxhash.xxh3_64_hexdigest(url)[:12]
     job = Job(
         id=job_id,
         title=details['title'],
@@ -579,85 +1008,295 @@ def process_job_url(conn: sqlite3.Connection, client: anthropic.Anthropic,
         match_score=match_score,
         source=ats_type,
     )
-    
-    # Create output directory
-    output_dir = CONFIG['output_dir'] / job_id
+
+    # Tailor resume and generate cover letter
+    tailored = tailor_resume(client, resume, analysis, job.title, job.company, conn)
+    letter = generate_cover_letter(client, resume, analysis, job.title, job.company, conn)
+
+    finalize_job(conn, job, resume, analysis, tailored, letter)
+
+    logger.info(f"✓ Processed: {job.title} at {job.company}")
+    return job
+
+
+def finalize_job(conn: sqlite3.Connection, job: Job, resume: MasterResume,
+                 analysis: dict, tailored: dict, letter: str):
+    """Write documents and persist a job once its AI content is ready"""
+    output_dir = CONFIG['output_dir'] / job.id
     output_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Tailor resume
-    tailored = tailor_resume(client, resume, analysis, job.title, job.company)
+
     resume_path = None
     if tailored:
-        resume_path = output_dir / f"resume_{company}_{job_id}.docx"
+        resume_path = output_dir / f"resume_{job.company}_{job.id}.docx"
         create_resume_docx(tailored, resume, resume_path)
         logger.info(f"  Created resume: {resume_path}")
-    
-    # Generate cover letter
-    letter = generate_cover_letter(client, resume, analysis, job.title, job.company)
+
     cl_path = None
     if letter:
-        cl_path = output_dir / f"cover_letter_{company}_{job_id}.docx"
+        cl_path = output_dir / f"cover_letter_{job.company}_{job.id}.docx"
         create_cover_letter_docx(letter, resume, job.title, job.company, cl_path)
         logger.info(f"  Created cover letter: {cl_path}")
-    
-    # Save analysis
-    with open(output_dir / "analysis.json", 'w') as f:
-        json.dump({
-            "job": asdict(job),
+
+    # Save analysis - orjson serializes the Job dataclass directly, no
+    # asdict deep copy needed
+    with open(output_dir / "analysis.json", 'wb') as f:
+        f.write(orjson.dumps({
+            "job": job,
             "analysis": analysis,
             "tailored": tailored,
-        }, f, indent=2)
-    
+        }, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_DATACLASS))
+
     # Save to database
-    save_job(conn, job, str(resume_path) if resume_path else None, 
+    save_job(conn, job, str(resume_path) if resume_path else None,
              str(cl_path) if cl_path else None)
-    
-    logger.info(f"✓ Processed: {job.title} at {job.company}")
-    return job
+
+
+_discovery: Optional[JobDiscovery] = None
+
+
+def get_discovery() -> JobDiscovery:
+    """Reuse one JobDiscovery across daemon iterations - constructing it
+    rebuilds the Google API service, which fetches the discovery document
+    over HTTPS"""
+    global _discovery
+    if _discovery is None:
+        _discovery = JobDiscovery()
+    return _discovery
 
 
 def run_discovery(conn: sqlite3.Connection, queries: list[str] = None):
     """Run Google search discovery"""
     logger.info("Starting job discovery...")
-    
-    discovery = JobDiscovery()
+
+    discovery = get_discovery()
     results = discovery.discover(queries=queries, max_results_per_query=30)
     
-    new_count = 0
-    for item in results:
-        url = item['url']
-        if not url_seen(conn, url):
-            save_discovered(conn, url, item.get('classification', {}))
-            new_count += 1
-    
+    # One executemany transaction for the whole pass instead of per-row
+    new_items = [(item['url'], item.get('classification', {}))
+                 for item in results if not url_seen(conn, item['url'])]
+    save_discovered_many(conn, new_items)
+    new_count = len(new_items)
+
     logger.info(f"Discovery complete: {new_count} new URLs saved")
     return new_count
 
 
 def run_processing(conn: sqlite3.Connection, client: anthropic.Anthropic,
-                   scraper: Scraper, resume: MasterResume, limit: int = None):
-    """Process pending discovered URLs"""
+                   scraper: Scraper, resume: MasterResume, limit: int = None,
+                   max_workers: int = 8):
+    """
+    Process pending discovered URLs in three phases:
+
+    1. Scrape and title-filter everything concurrently
+    2. Analyze all descriptions in one Message Batch
+    3. Tailor resumes + cover letters in a second batch, then write docs
+
+    Batching the Claude calls runs them concurrently server-side at half
+    the per-token cost of individual requests.
+    """
     limit = limit or CONFIG['max_jobs_per_run']
     pending = get_pending_urls(conn, limit)
-    
+
     logger.info(f"Processing {len(pending)} pending URLs...")
-    
-    processed = 0
-    for item in pending:
+
+    # Phase 1: scrape and title-filter concurrently; per-host politeness
+    # lives in the Scraper
+    def scrape(item: dict) -> Optional[dict]:
         url = item['url']
         classification = item['classification']
-        
+        details = scraper.get_job(url, classification.get('type', 'unknown'))
+        if not details or not details.get('description'):
+            logger.warning(f"Could not get job details from {url}")
+            return None
+        if not filter_by_title(details['title']):
+            logger.info(f"Skipping (title mismatch): {details['title']}")
+            return None
+        return {
+            'url': url,
+            'classification': classification,
+            'details': details,
+            'company': classification.get('company_slug') or 'Unknown',
+            'job_id': xxhash.xxh3_64_hexdigest(url)[:12],
+        }
+
+    candidates = []
+    rejected = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(scrape, item): item['url'] for item in pending}
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                candidate = future.result()
+            except Exception as e:
+                logger.error(f"Error scraping {url}: {e}")
+                candidate = None
+            if candidate:
+                candidates.append(candidate)
+            else:
+                rejected.append(url)
+    mark_processed_many(conn, rejected)
+
+    # Phase 2: one batch of analysis requests, keyed by job id. Cached
+    # responses (reposts, mirrored boards) skip the batch entirely
+    analyze_results = {}
+    analyze_requests = []
+    cache_keys = {}
+    for c in candidates:
+        # An identical description seen before shares its prior analysis,
+        # whatever URL it came from this time
+        c['desc_hash'] = desc_hash(c['details']['description'])
+        prior = get_analysis_by_desc(conn, c['desc_hash'])
+        if prior is not None:
+            c['analysis'] = prior
+            continue
+
+        prompt = build_analyze_prompt(c['details']['description'])
+        custom_id = f"{c['job_id']}:analyze"
+        key = prompt_cache_key('analyze', prompt)
+        cached = llm_cache_get(conn, key)
+        if cached is not None:
+            analyze_results[custom_id] = cached
+            continue
+        cache_keys[custom_id] = key
+        analyze_requests.append({
+            "custom_id": custom_id,
+            "params": {
+                "model": MODEL,
+                "max_tokens": 1500,
+                "messages": [{"role": "user", "content": prompt}],
+            },
+        })
+
+    fresh = run_message_batch(client, analyze_requests)
+    for custom_id, text in fresh.items():
+        # Cache only responses that parse - malformed ones would re-fail
+        # on every run until the TTL expired instead of being retried
         try:
-            job = process_job_url(conn, client, scraper, resume, url, classification)
-            if job:
+            parse_json_response(text)
+        except Exception:
+            continue
+        llm_cache_put(conn, cache_keys[custom_id], text)
+    analyze_results.update(fresh)
+
+    survivors = []
+    rejected = []
+    for c in candidates:
+        analysis = c.get('analysis')
+        if analysis is None:
+            analysis = {}
+            text = analyze_results.get(f"{c['job_id']}:analyze")
+            if text:
+                try:
+                    analysis = parse_json_response(text)
+                    save_analysis_by_desc(conn, c['desc_hash'], analysis)
+                except Exception as e:
+                    logger.error(f"Analysis error for {c['url']}: {e}")
+
+        match_score = calculate_match(analysis, resume)
+        if match_score < CONFIG['min_match_score']:
+            logger.info(f"Skipping (low match {match_score:.0%}): {c['details']['title']}")
+            rejected.append(c['url'])
+            continue
+
+        logger.info(f"Match {match_score:.0%}: {c['details']['title']} at {c['company']}")
+        c['analysis'] = analysis
+        c['match_score'] = match_score
+        survivors.append(c)
+    mark_processed_many(conn, rejected)
+
+    # Phase 3: tailoring + cover letters for the matches, two requests per
+    # job in a single batch (tailoring only depends on the analysis, so
+    # both can go out together)
+    followup_results = {}
+    followup = []
+    cache_keys = {}
+    for c in survivors:
+        title = c['details']['title']
+        for kind, max_tokens, prompt in (
+            ('tailor', 2500, build_tailor_prompt(resume, c['analysis'], title, c['company'])),
+            ('cover', 1200, build_cover_letter_prompt(resume, c['analysis'], title, c['company'])),
+        ):
+            custom_id = f"{c['job_id']}:{kind}"
+            key = prompt_cache_key(kind, prompt)
+            cached = llm_cache_get(conn, key)
+            if cached is not None:
+                followup_results[custom_id] = cached
+                continue
+            cache_keys[custom_id] = key
+            followup.append({
+                "custom_id": custom_id,
+                "params": {
+                    "model": MODEL,
+                    "max_tokens": max_tokens,
+                    "messages": [{"role": "user", "content": prompt}],
+                },
+            })
+
+    fresh = run_message_batch(client, followup)
+    for custom_id, text in fresh.items():
+        # Cover letters are plain text; only tailor responses need to
+        # parse as JSON before they are worth caching
+        if custom_id.endswith(':tailor'):
+            try:
+                parse_json_response(text)
+            except Exception:
+                continue
+        llm_cache_put(conn, cache_keys[custom_id], text)
+    followup_results.update(fresh)
+
+    # Document writes (docx zip serialization) are independent across jobs,
+    # so finalize in parallel too
+    processed = 0
+    done = []
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = {}
+        for c in survivors:
+            url = c['url']
+            try:
+                details = c['details']
+                job = Job(
+                    id=c['job_id'],
+                    title=details['title'],
+                    company=c['company'],
+                    url=url,
+                    location=details.get('location', 'Remote'),
+                    description=details['description'],
+                    requirements=c['analysis'].get('required_skills', []),
+                    keywords=c['analysis'].get('keywords', []),
+                    discovered_at=datetime.now().isoformat(),
+                    match_score=c['match_score'],
+                    source=c['classification'].get('type', 'unknown'),
+                )
+
+                tailored = {}
+                text = followup_results.get(f"{c['job_id']}:tailor")
+                if text:
+                    try:
+                        tailored = parse_json_response(text)
+                    except Exception as e:
+                        logger.error(f"Resume tailoring error for {url}: {e}")
+                letter = (followup_results.get(f"{c['job_id']}:cover") or '').strip()
+
+                future = executor.submit(
+                    finalize_job, conn, job, resume, c['analysis'], tailored, letter
+                )
+                futures[future] = (url, job)
+            except Exception as e:
+                logger.error(f"Error processing {url}: {e}")
+                done.append(url)
+
+        for future in as_completed(futures):
+            url, job = futures[future]
+            try:
+                future.result()
+                logger.info(f"✓ Processed: {job.title} at {job.company}")
                 processed += 1
-        except Exception as e:
-            logger.error(f"Error processing {url}: {e}")
-        finally:
-            mark_processed(conn, url)
-        
-        time.sleep(2)  # Rate limiting
-    
+            except Exception as e:
+                logger.error(f"Error processing {url}: {e}")
+            finally:
+                done.append(url)
+    mark_processed_many(conn, done)
+
     logger.info(f"Processed {processed} jobs")
     return processed
 
@@ -675,7 +1314,6 @@ def run_full(discover: bool = True):
         run_discovery(conn)
     
     run_processing(conn, client, scraper, resume)
-    conn.close()
 
 
 def show_stats():
@@ -699,8 +1337,6 @@ def show_stats():
     print("\nTop matches:")
     for row in cursor.fetchall():
         print(f"  [{row[2]:.0%}] {row[0]} at {row[1]}")
-    
-    conn.close()
 
 
 def main():
@@ -727,20 +1363,19 @@ def main():
         
         classification = URLClassifier.classify(args.url)
         process_job_url(conn, client, scraper, resume, args.url, classification)
-        conn.close()
+        conn.commit()
         return
     
     if args.daemon:
         logger.info(f"Starting daemon mode (every {args.interval} min)")
-        schedule.every(args.interval).minutes.do(run_full)
-        run_full()
+        # One recurring job - sleep the whole interval instead of waking
+        # every minute to let a scheduler library rescan its job list
         while True:
-            schedule.run_pending()
-            time.sleep(60)
+            run_full()
+            time.sleep(args.interval * 60)
     elif args.discover_only:
         conn = init_db()
         run_discovery(conn)
-        conn.close()
     elif args.process_only:
         conn = init_db()
         client = anthropic.Anthropic(api_key=CONFIG['anthropic_api_key'])
@@ -748,7 +1383,6 @@ def main():
         resume = load_resume()
         CONFIG['output_dir'].mkdir(parents=True, exist_ok=True)
         run_processing(conn, client, scraper, resume)
-        conn.close()
     else:
         run_full()
 
@@ -0,0 +1,22 @@
+-- Cache the per-user discovery query list on the profile so the pipeline
+-- reads one row instead of rebuilding queries from preferences every run
+ALTER TABLE public.profiles
+ADD COLUMN cached_queries TEXT[];
+
+-- Invalidate the cached queries whenever the preferences they were
+-- derived from change
+CREATE OR REPLACE FUNCTION public.invalidate_cached_queries()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF NEW.target_roles IS DISTINCT FROM OLD.target_roles
+     OR NEW.work_type IS DISTINCT FROM OLD.work_type THEN
+    NEW.cached_queries = NULL;
+  END IF;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SET search_path = public;
+
+CREATE TRIGGER invalidate_profiles_cached_queries
+BEFORE UPDATE ON public.profiles
+FOR EACH ROW
+EXECUTE FUNCTION public.invalidate_cached_queries();